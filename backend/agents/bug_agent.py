@@ -1,4 +1,42 @@
 import re
+import sys
+from bisect import bisect_left
+
+# Prefixes stripped from absolute paths to get the repo-relative file.
+_WORKSPACE_MARKER = "workspace/repo/"
+_REPO_MARKER = "/repo/"
+
+# Error names closing each traceback bucket; mirrors the old per-type
+# `File "...", line N.*?(Error)` patterns.
+_TRACEBACK_ERRORS = {
+    "SYNTAX": ("SyntaxError",),
+    "INDENTATION": ("IndentationError", "TabError"),
+    "IMPORT": ("ModuleNotFoundError", "ImportError"),
+    "TYPE_ERROR": ("TypeError", "ValueError"),
+    "LOGIC": ("NameError", "KeyError", "AssertionError", "AttributeError"),
+}
+_ERROR_NAMES = tuple(name for names in _TRACEBACK_ERRORS.values() for name in names)
+
+# One pass over the logs finds every traceback frame, collection header,
+# error name and candidate `path.py:N:` diagnostic line. Frames, headers and
+# diagnostics are zero-width so error names inside them are still seen.
+_RE_SCAN = re.compile(
+    r'(?P<frame>(?=File "(?P<frame_file>.+?\.py)", line (?P<frame_line>\d+)))'
+    r"|(?P<collect>(?=ERROR collecting (?P<collect_file>.+?\.py)))"
+    r"|(?P<diagnostic>^(?=[^\n]*?\.py:\d+:))"
+    r"|(?P<error>" + "|".join(_ERROR_NAMES) + r")",
+    re.DOTALL | re.MULTILINE,
+)
+
+# A zero-width frame/header at a line start hides the diagnostic match there.
+_RE_DIAGNOSTIC_LINE = re.compile(r"[^\n]*?\.py:\d+:")
+
+# Line diagnostics, only tried at the line starts found by _RE_SCAN.
+# Pytest short assertion format:
+# path.py:42: AssertionError
+_RE_LOGIC_SHORT = re.compile(r"(.+?\.py):(\d+):\s*AssertionError")
+_RE_LINT = re.compile(r"(.+?\.py):(\d+):(?:\d+:)?\s*(?:F401|W0611|.*unused import)")
+_RE_PYRIGHT = re.compile(r"(.+?\.py):(\d+):(\d+)\s*-\s*error:\s*(.+)")
 
 
 class BugAgent:
@@ -6,93 +44,65 @@ class BugAgent:
 
         bugs = []
         seen = set()
+        path_cache = {}
 
         if not logs:
             return bugs
 
-        # -----------------------------
-        # SYNTAX ERRORS
-        # -----------------------------
-        syntax_matches = re.findall(
-            r'File "(.+?\.py)", line (\d+).*?SyntaxError',
-            logs,
-            re.DOTALL,
-        )
-        for file_path, line in syntax_matches:
-            self._add_bug(bugs, seen, file_path, "SYNTAX", int(line))
-
-        # -----------------------------
-        # INDENTATION ERRORS
-        # -----------------------------
-        indentation_matches = re.findall(
-            r'File "(.+?\.py)", line (\d+).*?(IndentationError|TabError)',
-            logs,
-            re.DOTALL,
-        )
-        for file_path, line, _ in indentation_matches:
-            self._add_bug(bugs, seen, file_path, "INDENTATION", int(line))
-
-        # -----------------------------
-        # IMPORT ERRORS
-        # -----------------------------
-        import_matches = re.findall(
-            r'File "(.+?\.py)", line (\d+).*?(ModuleNotFoundError|ImportError)',
-            logs,
-            re.DOTALL,
-        )
-        for file_path, line, _ in import_matches:
-            self._add_bug(bugs, seen, file_path, "IMPORT", int(line))
+        frames = []
+        collects = []
+        line_starts = []
+        errors = {name: [] for name in _ERROR_NAMES}
+
+        for match in _RE_SCAN.finditer(logs):
+            kind = match.lastgroup
+            start = match.start()
+            if (
+                kind in ("frame", "collect")
+                and (start == 0 or logs[start - 1] == "\n")
+                and _RE_DIAGNOSTIC_LINE.match(logs, start)
+            ):
+                line_starts.append(start)
+
+            if kind == "frame":
+                frames.append(
+                    (
+                        start,
+                        match.end("frame_line"),
+                        (match.group("frame_file"), int(match.group("frame_line"))),
+                    )
+                )
+            elif kind == "collect":
+                collect_file = match.group("collect_file")
+                collects.append((start, match.end("collect_file"), (collect_file, 1)))
+            elif kind == "diagnostic":
+                line_starts.append(start)
+            else:
+                errors[match.group("error")].append((start, match.end()))
 
         # -----------------------------
-        # TYPE ERRORS
+        # SYNTAX / INDENTATION / IMPORT / TYPE / LOGIC tracebacks
         # -----------------------------
-        type_matches = re.findall(
-            r'File "(.+?\.py)", line (\d+).*?(TypeError|ValueError)',
-            logs,
-            re.DOTALL,
-        )
-        for file_path, line, _ in type_matches:
-            self._add_bug(bugs, seen, file_path, "TYPE_ERROR", int(line))
+        for bug_type, names in _TRACEBACK_ERRORS.items():
+            tokens = sorted(token for name in names for token in errors[name])
+            for file_path, line in self._pair(frames, tokens):
+                self._add_bug(bugs, seen, path_cache, file_path, bug_type, line)
 
-        # -----------------------------
-        # LOGIC ERRORS
-        # -----------------------------
-        logic_matches = re.findall(
-            r'File "(.+?\.py)", line (\d+).*?(NameError|KeyError|AssertionError|AttributeError)',
-            logs,
-            re.DOTALL,
-        )
-        for file_path, line, _ in logic_matches:
-            self._add_bug(bugs, seen, file_path, "LOGIC", int(line))
-
-        # Pytest short assertion format:
-        # path.py:42: AssertionError
-        logic_short_matches = re.findall(
-            r"(.+?\.py):(\d+):\s*AssertionError",
-            logs,
-        )
-        for file_path, line in logic_short_matches:
-            self._add_bug(bugs, seen, file_path, "LOGIC", int(line))
+        # Pytest short assertion format
+        for match in self._match_lines(_RE_LOGIC_SHORT, logs, line_starts):
+            self._add_bug(bugs, seen, path_cache, match.group(1), "LOGIC", int(match.group(2)))
 
         # -----------------------------
         # LINT / UNUSED IMPORT
         # -----------------------------
-        lint_matches = re.findall(
-            r"(.+?\.py):(\d+):(?:\d+:)?\s*(?:F401|W0611|.*unused import)",
-            logs,
-        )
-        for file_path, line in lint_matches:
-            self._add_bug(bugs, seen, file_path, "LINTING", int(line))
+        for match in self._match_lines(_RE_LINT, logs, line_starts):
+            self._add_bug(bugs, seen, path_cache, match.group(1), "LINTING", int(match.group(2)))
 
         # -----------------------------
         # basedpyright / pyright diagnostics
         # -----------------------------
-        pyright_matches = re.findall(
-            r"(.+?\.py):(\d+):(\d+)\s*-\s*error:\s*(.+)",
-            logs,
-        )
-        for file_path, line, _col, message in pyright_matches:
-            msg = message.lower()
+        for match in self._match_lines(_RE_PYRIGHT, logs, line_starts):
+            msg = match.group(4).lower()
             if "import" in msg or "cannot be resolved" in msg:
                 bug_type = "IMPORT"
             elif "type" in msg or "argument of type" in msg or "cannot assign" in msg:
@@ -101,28 +111,55 @@ class BugAgent:
                 bug_type = "SYNTAX"
             else:
                 bug_type = "LOGIC"
-            self._add_bug(bugs, seen, file_path, bug_type, int(line))
+            self._add_bug(bugs, seen, path_cache, match.group(1), bug_type, int(match.group(2)))
 
         # -----------------------------
         # Pytest collection import errors
         # -----------------------------
-        collecting_matches = re.findall(
-            r"ERROR collecting (.+?\.py).*?ImportError",
-            logs,
-            re.DOTALL,
-        )
-        for file_path in collecting_matches:
-            self._add_bug(bugs, seen, file_path, "IMPORT", 1)
+        for file_path, line in self._pair(collects, errors["ImportError"]):
+            self._add_bug(bugs, seen, path_cache, file_path, "IMPORT", line)
 
         # Fallback: if logs indicate failure but nothing parsed, add UNKNOWN bug
         if logs and not bugs:
-            self._add_bug(bugs, seen, "<unknown>", "UNKNOWN", 1)
+            self._add_bug(bugs, seen, path_cache, "<unknown>", "UNKNOWN", 1)
 
         return bugs
 
-    def _add_bug(self, bugs, seen, file_path, bug_type, line):
-        clean = self.clean_path(file_path)
-        key = (clean, bug_type, int(line))
+    @staticmethod
+    def _pair(candidates, tokens):
+        # Leftmost-match pairing of each header with the first error name
+        # after it, resuming the search after that error.
+        starts = [start for start, _ in tokens]
+        paired = []
+        pos = 0
+        for start, end, value in candidates:
+            if start < pos:
+                continue
+            idx = bisect_left(starts, end)
+            if idx == len(tokens):
+                break
+            paired.append(value)
+            pos = tokens[idx][1]
+        return paired
+
+    @staticmethod
+    def _match_lines(pattern, logs, line_starts):
+        matches = []
+        pos = 0
+        for start in line_starts:
+            pos = max(pos, start)
+            while (match := pattern.match(logs, pos)) is not None:
+                matches.append(match)
+                pos = match.end()
+        return matches
+
+    def _add_bug(self, bugs, seen, path_cache, file_path, bug_type, line):
+        # The same traceback paths repeat across many matches; clean each once.
+        clean = path_cache.get(file_path)
+        if clean is None:
+            # Interned so the dedupe tuples hash and compare by identity.
+            clean = path_cache[file_path] = sys.intern(self.clean_path(file_path))
+        key = (clean, bug_type, line)
         if key in seen:
             return
         seen.add(key)
@@ -130,7 +167,7 @@ class BugAgent:
             {
                 "file": clean,
                 "bug_type": bug_type,
-                "line": int(line),
+                "line": line,
                 "status": "Detected",
             }
         )
@@ -140,10 +177,12 @@ class BugAgent:
     # -----------------------------
     def clean_path(self, full_path):
 
-        if "workspace/repo/" in full_path:
-            return full_path.split("workspace/repo/")[1]
+        _, sep, rel = full_path.partition(_WORKSPACE_MARKER)
+        if sep:
+            return rel
 
-        if "/repo/" in full_path:
-            return full_path.split("/repo/")[1]
+        _, sep, rel = full_path.partition(_REPO_MARKER)
+        if sep:
+            return rel
 
         return full_path
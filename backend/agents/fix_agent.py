@@ -1,53 +1,138 @@
 import os
 import re
 import subprocess
+import time
 from functools import lru_cache
+from itertools import groupby
+from operator import itemgetter
 
 from agents.groq_ai_agent import GroqAIAgent
 
+# Line rewrites used by the local fixers.
+_RE_DUP_COMMA = re.compile(r",\s*,+")
+_RE_TRAIL_COLON = re.compile(r"\s*:\s*$")
+_RE_TRAIL_COMMA = re.compile(r",\s*$")
+_RE_WS = re.compile(r"\s+")
+_RE_QUOTED_NUM = re.compile(r'([+\-*/%]\s*)["\'](-?\d+(?:\.\d+)?)["\']')
+_RE_INT_CALL = re.compile(r"int\(([^()]+)\)")
+_RE_SAFE_GET = re.compile(r"^(\s*return\s+)([A-Za-z_]\w*)\[(.+)\](\s*)$")
+
+# Statements that open a block and must end with a colon.
+_COLON_KEYWORDS = frozenset(
+    {"def", "class", "if", "elif", "else", "for", "while", "try", "except", "finally", "with"}
+)
+_IMPORT_KEYWORDS = frozenset({"import", "from"})
+
+# Files modified within this window get a content compare around ruff runs.
+_RACY_WINDOW_NS = 2_000_000_000
+
 
 class FixAgent:
     def __init__(self, logger=None):
         self.groq = GroqAIAgent()
         self._logger = logger
 
+    def close(self):
+        self.groq.close()
+
     def apply_fixes(self, repo_path, bugs):
 
         fixes = []
+        results = [[bug, False, False] for bug in bugs]
+        groq_jobs = []
+        exists_cache = {}
+
+        def _exists(path):
+            # Several bugs usually point at the same file; stat it once per batch.
+            exists = exists_cache.get(path)
+            if exists is None:
+                exists = exists_cache[path] = os.path.exists(path)
+            return exists
+
+        # Line-level fixes: read each file once, rewrite each targeted line once
+        # with every bug type reported for it, write once. Sorting by
+        # (path, index) groups both levels and walks each file top to bottom.
+        prepared = sorted(
+            (os.path.join(repo_path, bug["file"]), bug["line"] - 1, bug["bug_type"], pos)
+            for pos, bug in enumerate(bugs)
+            if bug["bug_type"] in _LINE_RULES and bug["line"] > 0
+        )
 
-        for bug in bugs:
+        for file_path, file_bugs in groupby(prepared, key=itemgetter(0)):
+            if not _exists(file_path):
+                continue
+
+            lines = _read_lines(file_path)
+
+            dirty = False
+            for idx, line_bugs in groupby(file_bugs, key=itemgetter(1)):
+                if idx >= len(lines):
+                    # Sorted, so every remaining index is past the end too.
+                    break
+                line_bugs = list(line_bugs)
+                lines[idx], changed = rewrite_line(
+                    lines[idx],
+                    lines[idx - 1] if idx else None,
+                    {bug_type for _, _, bug_type, _ in line_bugs},
+                )
+                for _, _, bug_type, pos in line_bugs:
+                    results[pos][1] = bug_type in changed
+                dirty = dirty or bool(changed)
+
+            if dirty:
+                _write_lines(file_path, lines)
+
+        # Whole-file fixes run after, so ruff cannot shift the lines above.
+        # One ruff process covers every linted file in the batch.
+        lint_files = {
+            bug["file"]: None
+            for bug in bugs
+            if bug["bug_type"] == "LINTING" and _exists(os.path.join(repo_path, bug["file"]))
+        }
+        ruff_changed = self._ruff_fix_many(repo_path, list(lint_files)) if lint_files else set()
+
+        for result in results:
+            bug = result[0]
             bug_type = bug["bug_type"]
             file_path = os.path.join(repo_path, bug["file"])
-            fixed = False
-
-            if bug_type == "SYNTAX" and os.path.exists(file_path):
-                fixed = self.fix_syntax_issue(file_path, bug["line"])
-            elif bug_type == "INDENTATION" and os.path.exists(file_path):
-                fixed = self.fix_indentation_issue(file_path, bug["line"])
-            elif bug_type == "LINTING" and os.path.exists(file_path):
-                fixed = self.fix_with_ruff(repo_path, bug["file"])
-            elif bug_type == "TYPE_ERROR" and os.path.exists(file_path):
-                fixed = self.fix_type_error(file_path, bug["line"])
-            elif bug_type == "LOGIC" and os.path.exists(file_path):
-                fixed = self.fix_logic_issue(file_path, bug["line"])
+
+            if bug_type == "LINTING":
+                result[1] = bug["file"] in ruff_changed
             elif bug_type == "IMPORT":
-                fixed = self.fix_missing_init(repo_path, bug["file"])
+                result[1] = self.fix_missing_init(repo_path, bug["file"])
+
+            if not result[1] and bug_type != "UNKNOWN" and bug["file"] != "<unknown>":
+                result[2] = True
+                groq_jobs.append(
+                    (
+                        bug,
+                        result,
+                        {"file_path": file_path, "bug_type": bug_type, "line_no": bug["line"]},
+                    )
+                )
+            elif bug_type == "UNKNOWN" or bug["file"] == "<unknown>":
+                self._log("[AGENT] Skipping Groq for UNKNOWN failure; no concrete file/line target")
 
-            used_groq = False
-            if not fixed and bug_type != "UNKNOWN" and bug["file"] != "<unknown>":
-                used_groq = True
+        # Send every Groq fallback at once; the agent pipelines them concurrently.
+        if groq_jobs:
+            for bug, _, _ in groq_jobs:
                 self._log(
-                    f"[AGENT][GROQ] Attempting fix for {bug_type} at {bug['file']}:{bug['line']} "
-                    f"(timeout {self.groq.timeout}s)"
+                    f"[AGENT][GROQ] Attempting fix for {bug['bug_type']} at "
+                    f"{bug['file']}:{bug['line']} (timeout {self.groq.timeout}s)"
                 )
-                fixed = self.groq.fix_file(file_path, bug_type, bug["line"])
+            outcomes = self.groq.fix_files([job for _, _, job in groq_jobs])
+            for (bug, result, _), fixed in zip(groq_jobs, outcomes):
+                result[1] = fixed
                 if fixed:
-                    self._log("[AGENT] Fix applied")
+                    self._log(f"[AGENT] Fix applied at {bug['file']}:{bug['line']}")
                 else:
-                    self._log("[AGENT] Fix failed, no changes, or timed out")
-            elif bug_type == "UNKNOWN" or bug["file"] == "<unknown>":
-                self._log("[AGENT] Skipping Groq for UNKNOWN failure; no concrete file/line target")
+                    self._log(
+                        f"[AGENT] Fix failed, no changes, or timed out at "
+                        f"{bug['file']}:{bug['line']}"
+                    )
 
+        for bug, fixed, used_groq in results:
+            bug_type = bug["bug_type"]
             if fixed:
                 prefix = "[AI-AGENT]" if used_groq else "[AI-AGENT]"
                 commit_message = f"{prefix} Fix {bug_type} error"
@@ -70,92 +155,13 @@ class FixAgent:
     # FIX 1 - Syntax
     # -----------------------------
     def fix_syntax_issue(self, file_path, line_no):
-
-        with open(file_path, "r") as f:
-            lines = f.readlines()
-
-        if line_no <= 0 or line_no > len(lines):
-            return False
-
-        changed = False
-        line = lines[line_no - 1]
-
-        # Common broken import patterns: duplicate commas / accidental trailing colon
-        if line.lstrip().startswith(("import ", "from ")):
-            cleaned = line.rstrip()
-            cleaned = re.sub(r",\s*,+", ", ", cleaned)
-            cleaned = re.sub(r"\s*:\s*$", "", cleaned)
-            cleaned = re.sub(r",\s*$", "", cleaned)
-            cleaned = re.sub(r"\s+", " ", cleaned).strip()
-
-            # Normalize comma spacing in import lists.
-            if cleaned.startswith("import "):
-                head, tail = cleaned.split("import ", 1)
-                modules = [m.strip() for m in tail.split(",") if m.strip()]
-                if modules:
-                    cleaned = f"{head}import {', '.join(modules)}".strip()
-
-            if cleaned != line.rstrip():
-                lines[line_no - 1] = cleaned + "\n"
-                changed = True
-
-        # Missing colon in blocks/defs
-        current = lines[line_no - 1]
-        stripped = current.strip()
-        colon_targets = (
-            "def ",
-            "class ",
-            "if ",
-            "elif ",
-            "else",
-            "for ",
-            "while ",
-            "try",
-            "except ",
-            "finally",
-            "with ",
-        )
-        if stripped.startswith(colon_targets) and not stripped.endswith(":"):
-            lines[line_no - 1] = current.rstrip() + ":\n"
-            changed = True
-
-        if not changed:
-            return False
-
-        with open(file_path, "w") as f:
-            f.writelines(lines)
-        return True
+        return self._fix_file_line(file_path, line_no, "SYNTAX")
 
     # -----------------------------
     # FIX 1b - Indentation / Tabs
     # -----------------------------
     def fix_indentation_issue(self, file_path, line_no):
-
-        with open(file_path, "r") as f:
-            lines = f.readlines()
-
-        if line_no <= 0 or line_no > len(lines):
-            return False
-
-        changed = False
-        original = lines[line_no - 1]
-        updated = original.replace("\t", "    ")
-        if updated != original:
-            changed = True
-
-        # If previous line opens a block and current line is not indented, indent it.
-        if line_no > 1 and lines[line_no - 2].rstrip().endswith(":"):
-            if updated.strip() and not updated.startswith((" ", "\t")):
-                updated = "    " + updated
-                changed = True
-
-        lines[line_no - 1] = updated
-        if not changed:
-            return False
-
-        with open(file_path, "w") as f:
-            f.writelines(lines)
-        return True
+        return self._fix_file_line(file_path, line_no, "INDENTATION")
 
     # -----------------------------
     # FIX 2 - Lint / Import Cleanup via Ruff
@@ -164,96 +170,55 @@ class FixAgent:
         target_file = os.path.join(repo_path, rel_file)
         if not os.path.exists(target_file):
             return False
+        return rel_file in self._ruff_fix_many(repo_path, [rel_file])
 
-        before = ""
-        with open(target_file, "r") as f:
-            before = f.read()
-
+    def _ruff_fix_many(self, repo_path, rel_files):
+        # Caller has already checked that the files exist; returns those ruff rewrote.
         python_bin = self._cached_python(repo_path)
         if not os.path.exists(python_bin):
-            return False
-
-        self._run_safe([python_bin, "-m", "ruff", "check", "--fix", rel_file], repo_path)
-
-        with open(target_file, "r") as f:
-            after = f.read()
-
-        return before != after
+            return set()
+
+        # Detect rewrites by (mtime_ns, size). Only files touched moments ago could
+        # share a timestamp tick with ruff's write, so only those keep a copy.
+        before = {}
+        now = time.time_ns()
+        for rel_file in rel_files:
+            target_file = os.path.join(repo_path, rel_file)
+            st = os.stat(target_file)
+            content = None
+            if now - st.st_mtime_ns < _RACY_WINDOW_NS:
+                with open(target_file, "rb") as f:
+                    content = f.read()
+            before[rel_file] = (st.st_mtime_ns, st.st_size, content)
+
+        self._run_safe([python_bin, "-m", "ruff", "check", "--fix", *rel_files], repo_path)
+
+        changed = set()
+        for rel_file, (mtime_ns, size, content) in before.items():
+            target_file = os.path.join(repo_path, rel_file)
+            try:
+                st = os.stat(target_file)
+            except FileNotFoundError:
+                continue
+            if st.st_mtime_ns != mtime_ns or st.st_size != size:
+                changed.add(rel_file)
+            elif content is not None:
+                with open(target_file, "rb") as f:
+                    if f.read() != content:
+                        changed.add(rel_file)
+        return changed
 
     # -----------------------------
     # FIX 3 - Runtime Type Errors
     # -----------------------------
     def fix_type_error(self, file_path, line_no):
-        with open(file_path, "r") as f:
-            lines = f.readlines()
-
-        if line_no <= 0 or line_no > len(lines):
-            return False
-
-        changed = False
-        line = lines[line_no - 1]
-
-        # If arithmetic uses quoted numbers, coerce to numeric literals.
-        normalized = re.sub(
-            r'([+\-*/%]\s*)["\'](-?\d+(?:\.\d+)?)["\']',
-            r"\1\2",
-            line,
-        )
-        if normalized != line:
-            line = normalized
-            changed = True
-
-        # If int(...) conversion is failing for float-like strings, attempt float-first cast.
-        if "int(" in line and "int(float(" not in line:
-            wrapped = re.sub(r"int\(([^()]+)\)", r"int(float(\1))", line)
-            if wrapped != line:
-                line = wrapped
-                changed = True
-
-        if not changed:
-            return False
-
-        lines[line_no - 1] = line
-        with open(file_path, "w") as f:
-            f.writelines(lines)
-        return True
+        return self._fix_file_line(file_path, line_no, "TYPE_ERROR")
 
     # -----------------------------
     # FIX 4 - Runtime Logic Errors
     # -----------------------------
     def fix_logic_issue(self, file_path, line_no):
-        with open(file_path, "r") as f:
-            lines = f.readlines()
-
-        if line_no <= 0 or line_no > len(lines):
-            return False
-
-        line = lines[line_no - 1]
-        changed = False
-
-        # Convert direct dict indexing in return paths to safe access.
-        # Example: return cfg[key] -> return cfg.get(key)
-        safe_get = re.sub(
-            r"^(\s*return\s+)([A-Za-z_]\w*)\[(.+)\](\s*)$",
-            r"\1\2.get(\3)\4",
-            line,
-        )
-        if safe_get != line:
-            line = safe_get
-            changed = True
-
-        # Prefer true division when floor-division causes assertion mismatches.
-        if "//" in line:
-            line = line.replace("//", "/")
-            changed = True
-
-        if not changed:
-            return False
-
-        lines[line_no - 1] = line
-        with open(file_path, "w") as f:
-            f.writelines(lines)
-        return True
+        return self._fix_file_line(file_path, line_no, "LOGIC")
 
     # -----------------------------
     # FIX 5 - Missing __init__.py
@@ -275,6 +240,20 @@ class FixAgent:
     # -----------------------------
     # Helpers
     # -----------------------------
+    @staticmethod
+    def _fix_file_line(file_path, line_no, action):
+        lines = _read_lines(file_path)
+        if line_no <= 0 or line_no > len(lines):
+            return False
+
+        idx = line_no - 1
+        lines[idx], changed = rewrite_line(lines[idx], lines[idx - 1] if idx else None, {action})
+        if not changed:
+            return False
+
+        _write_lines(file_path, lines)
+        return True
+
     @staticmethod
     @lru_cache(maxsize=16)
     def _cached_python(repo_path):
@@ -282,12 +261,13 @@ class FixAgent:
         return os.path.join(venv_path, "bin", "python")
 
     def _run_safe(self, cmd, repo_path, timeout=180):
+        # Output is never read; DEVNULL skips the pipes and the decoding.
         try:
             subprocess.run(
                 cmd,
                 cwd=repo_path,
-                capture_output=True,
-                text=True,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
                 timeout=timeout,
             )
         except subprocess.TimeoutExpired:
@@ -301,3 +281,139 @@ class FixAgent:
             self._logger(message)
         else:
             print(message)
+
+
+def _read_lines(path):
+    # readlines() splits on newlines only, matching Python's line numbering;
+    # str.splitlines() would also break on form feeds and \u2028.
+    with open(path, "r", encoding="utf-8") as f:
+        return f.readlines()
+
+
+def _write_lines(path, lines):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("".join(lines))
+
+
+# -----------------------------
+# Line rules: (line, prev_line) -> line, no I/O
+# -----------------------------
+def _syntax_rule(line, prev_line):
+
+    # Common broken import patterns: duplicate commas / accidental trailing colon
+    if _first_token(line) in _IMPORT_KEYWORDS:
+        cleaned = line.rstrip()
+        cleaned = _RE_DUP_COMMA.sub(", ", cleaned)
+        cleaned = _RE_TRAIL_COLON.sub("", cleaned)
+        cleaned = _RE_TRAIL_COMMA.sub("", cleaned)
+        cleaned = _RE_WS.sub(" ", cleaned).strip()
+
+        # Normalize comma spacing in import lists.
+        if cleaned.startswith("import "):
+            head, tail = cleaned.split("import ", 1)
+            modules = [m.strip() for m in tail.split(",") if m.strip()]
+            if modules:
+                cleaned = f"{head}import {', '.join(modules)}".strip()
+
+        if cleaned != line.rstrip():
+            line = cleaned + "\n"
+
+    # Missing colon in blocks/defs
+    stripped = line.strip()
+    if _first_token(stripped) in _COLON_KEYWORDS and not stripped.endswith(":"):
+        line = line.rstrip() + ":\n"
+
+    return line
+
+
+def _indentation_rule(line, prev_line):
+
+    updated = line.replace("\t", "    ")
+
+    # If previous line opens a block and current line is not indented, indent it.
+    if prev_line is not None and prev_line.rstrip().endswith(":"):
+        if updated.strip() and not updated.startswith((" ", "\t")):
+            updated = "    " + updated
+
+    return updated
+
+
+def _type_error_rule(line, prev_line):
+
+    # If arithmetic uses quoted numbers, coerce to numeric literals.
+    line = _RE_QUOTED_NUM.sub(r"\1\2", line)
+
+    # If int(...) conversion is failing for float-like strings, attempt float-first cast.
+    if "int(" in line and "int(float(" not in line:
+        line = _RE_INT_CALL.sub(r"int(float(\1))", line)
+
+    return line
+
+
+def _logic_rule(line, prev_line):
+
+    # Convert direct dict indexing in return paths to safe access.
+    # Example: return cfg[key] -> return cfg.get(key)
+    line = _RE_SAFE_GET.sub(r"\1\2.get(\3)\4", line)
+
+    # Prefer true division when floor-division causes assertion mismatches.
+    if "//" in line:
+        line = _replace_floor_div(line)
+
+    return line
+
+
+# Applied in this order when several bug types hit the same line.
+_LINE_RULES = {
+    "SYNTAX": _syntax_rule,
+    "INDENTATION": _indentation_rule,
+    "TYPE_ERROR": _type_error_rule,
+    "LOGIC": _logic_rule,
+}
+
+
+def rewrite_line(line, prev_line, actions):
+    """Run the rules for `actions` over one line; return (line, actions that changed it)."""
+    changed = set()
+    for action, rule in _LINE_RULES.items():
+        if action in actions:
+            updated = rule(line, prev_line)
+            if updated != line:
+                line = updated
+                changed.add(action)
+    return line, changed
+
+
+def _replace_floor_div(line):
+    # Swap "//" for "/" in code only; URLs in strings and comments stay intact.
+    out = []
+    quote = None
+    i = 0
+    while i < len(line):
+        ch = line[i]
+        step = 1
+        if quote:
+            if ch == "\\":
+                step = 2
+            elif line.startswith(quote, i):
+                step = len(quote)
+                quote = None
+        elif ch == "#":
+            out.append(line[i:])
+            break
+        elif ch in "'\"":
+            quote = ch * 3 if line.startswith(ch * 3, i) else ch
+            step = len(quote)
+        elif line.startswith("//", i):
+            out.append("/")
+            i += 2
+            continue
+        out.append(line[i : i + step])
+        i += step
+    return "".join(out)
+
+
+def _first_token(text):
+    # Leading keyword of a statement, e.g. "else" for "else:" or "def" for "def f(".
+    parts = text.split(None, 1)
+    return parts[0].rstrip(":") if parts else ""
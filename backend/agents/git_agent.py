@@ -1,52 +1,81 @@
 import os
+import shutil
+import stat
 import subprocess
-
-from git import Repo
+from typing import Set
 
 
 class GitAgent:
     """Git helper with safe defaults and minimal side effects."""
 
+    # Paths already registered as safe.directory by this process.
+    _safe_dirs: Set[str] = set()
+
     def _ensure_safe_directory(self, path: str) -> None:
         abs_path = os.path.abspath(path)
+        if abs_path in self._safe_dirs:
+            return
         # Ignore failures; only needed when repo owners differ.
-        subprocess.run(
-            ["git", "config", "--global", "--add", "safe.directory", abs_path],
-            check=False,
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL,
-            timeout=2,
-        )
+        try:
+            subprocess.run(
+                ["git", "config", "--global", "--add", "safe.directory", abs_path],
+                check=False,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                timeout=2,
+            )
+        except (OSError, subprocess.TimeoutExpired):
+            return
+        self._safe_dirs.add(abs_path)
 
     # -----------------------------
     # Create new branch
     # -----------------------------
     def create_branch(self, path: str, team: str, leader: str) -> str:
+        from git import Head, RemoteReference, Repo
+
         self._ensure_safe_directory(path)
 
         repo = Repo(path)
 
-        # Ensure we're on main/master first
-        try:
-            repo.git.checkout("main")
-        except Exception:
-            repo.git.checkout("master")
+        # Ensure we're on main/master first; main wins even if only on origin.
+        main = Head(repo, "refs/heads/main")
+        master = Head(repo, "refs/heads/master")
+        if main.is_valid():
+            self._checkout(repo, main)
+        elif master.is_valid() and not RemoteReference(repo, "refs/remotes/origin/main").is_valid():
+            self._checkout(repo, master)
+        else:
+            # Base only exists on the remote (clone of another default branch);
+            # let git's checkout DWIM create the tracking branch.
+            try:
+                repo.git.checkout("main")
+            except Exception:
+                repo.git.checkout("master")
 
         branch = f"{team}_{leader}_AI_Fix".upper().replace(" ", "_")
 
-        # Reuse existing branch if present, else create it.
-        existing = {head.name for head in repo.heads}
-        if branch in existing:
-            repo.git.checkout(branch)
-        else:
-            repo.git.checkout("-b", branch)
+        # Reuse existing branch if present, else create it. Resolving the one
+        # ref in-process avoids listing every head or forking rev-parse.
+        head = Head(repo, f"refs/heads/{branch}")
+        if not head.is_valid():
+            head = repo.create_head(branch)
+        self._checkout(repo, head)
 
         return branch
 
+    def _checkout(self, repo, head) -> None:
+        # HEAD is read in-process; only fork git when the branch really changes.
+        if not repo.head.is_detached and repo.head.reference == head:
+            return
+        head.checkout()
+
     # -----------------------------
     # Commit + Push fixes
     # -----------------------------
     def commit_push(self, path: str, fixes) -> bool:
+        from git import Repo
+
         self._ensure_safe_directory(path)
 
         repo = Repo(path)
@@ -71,17 +100,18 @@ class GitAgent:
     def cleanup_repo(self, path: str) -> None:
         # Best-effort removal of the working repo to force a fresh clone next run.
         try:
+            from git import Repo
+
             repo = Repo(path)
             repo.close()
         except Exception:
             pass
         try:
-            subprocess.run(
-                ["rm", "-rf", path],
-                check=False,
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL,
-                timeout=10,
-            )
+            shutil.rmtree(path, onerror=self._remove_readonly)
         except Exception:
             pass
+
+    def _remove_readonly(self, func, path, _):
+        # Git marks pack files read-only; clear the bit and retry.
+        os.chmod(path, stat.S_IWRITE)
+        func(path)
@@ -1,9 +1,174 @@
+import ast
 import asyncio
+import atexit
+import hashlib
 import os
-from typing import Optional
+import threading
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 from dotenv import load_dotenv
-from openai import AsyncOpenAI, OpenAI
+from openai import AsyncOpenAI, DefaultAioHttpClient
+
+GROQ_BASE_URL = "https://api.groq.com/openai/v1"
+# Requests in flight per batch; keeps bursts under Groq's per-minute limits.
+MAX_CONCURRENT_FIXES = 4
+
+# One loop + one client per (api_key, base_url) for the whole process, so
+# every GroqAIAgent shares the same connection pool.
+_CLIENT_CACHE: Dict[str, AsyncOpenAI] = {}
+_CACHE_LOCK = threading.Lock()
+_LOOP: Optional[asyncio.AbstractEventLoop] = None
+_LOOP_THREAD: Optional[threading.Thread] = None
+
+
+def _shared_loop() -> asyncio.AbstractEventLoop:
+    global _LOOP, _LOOP_THREAD
+    if _LOOP is None:
+        _LOOP = asyncio.new_event_loop()
+        _LOOP_THREAD = threading.Thread(target=_LOOP.run_forever, name="groq-ai-loop", daemon=True)
+        _LOOP_THREAD.start()
+    return _LOOP
+
+
+def _run_on(loop: asyncio.AbstractEventLoop, coro):
+    if loop.is_closed():
+        coro.close()
+        raise RuntimeError("Groq event loop is closed")
+    return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+
+async def _create_client(api_key: str, base_url: str) -> AsyncOpenAI:
+    # aiohttp sessions are bound to the loop they are created on.
+    return AsyncOpenAI(api_key=api_key, base_url=base_url, http_client=DefaultAioHttpClient())
+
+
+def get_client(api_key: str, base_url: str = GROQ_BASE_URL):
+    """
+    Return the shared client for (api_key, base_url) and the loop it runs on.
+    """
+    key = hashlib.sha256(f"{api_key}|{base_url}".encode()).hexdigest()
+    with _CACHE_LOCK:
+        loop = _shared_loop()
+        client = _CLIENT_CACHE.get(key)
+        if client is None:
+            client = _run_on(loop, _create_client(api_key, base_url))
+            _CLIENT_CACHE[key] = client
+        return client, loop
+
+
+def close_clients() -> None:
+    """
+    Close every cached client and stop the shared loop.
+    """
+    global _LOOP, _LOOP_THREAD
+    with _CACHE_LOCK:
+        loop, thread = _LOOP, _LOOP_THREAD
+        clients = list(_CLIENT_CACHE.values())
+        _CLIENT_CACHE.clear()
+        _LOOP, _LOOP_THREAD = None, None
+
+    if loop is None:
+        return
+
+    for client in clients:
+        try:
+            _run_on(loop, client.close())
+        except Exception:
+            pass
+
+    loop.call_soon_threadsafe(loop.stop)
+    if thread is not None:
+        thread.join(timeout=5)
+    loop.close()
+
+
+atexit.register(close_clients)
+
+
+def _read_text(path: str) -> str:
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def _write_text(path: str, text: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def _compiles(source: str, file_path: str) -> bool:
+    try:
+        compile(source, file_path, "exec")
+    except (SyntaxError, ValueError):
+        return False
+    return True
+
+
+def _local_fix(
+    source: str, file_path: str, bug_type: str, line_no: int
+) -> Tuple[bool, Optional[str]]:
+    """
+    Cheap fixes that need no model call.
+
+    Returns (handled, fixed_source); handled=False means ask Groq.
+    """
+    if not file_path.endswith(".py"):
+        return False, None
+
+    if bug_type in ("SYNTAX", "INDENTATION"):
+        # Already valid Python: nothing left for the model to repair.
+        return _compiles(source, file_path), None
+
+    # Package __init__ imports are usually re-exports; ruff leaves them alone.
+    if bug_type != "LINTING" or os.path.basename(file_path) == "__init__.py":
+        return False, None
+
+    # Unused import (F401): drop a single-name import that owns its line.
+    try:
+        tree = ast.parse(source)
+    except SyntaxError:
+        return False, None
+    exported = _exported_names(tree)
+
+    lines = source.splitlines(keepends=True)
+    for node in ast.walk(tree):
+        if not isinstance(node, (ast.Import, ast.ImportFrom)) or node.lineno != line_no:
+            continue
+        if node.end_lineno != line_no or len(node.names) != 1 or line_no > len(lines):
+            return False, None
+        alias = node.names[0]
+        bound = alias.asname or alias.name.split(".")[0]
+        # "import x as x" and names in __all__ are deliberate re-exports.
+        if alias.asname == alias.name or bound in exported:
+            return False, None
+        segment = ast.get_source_segment(source, node) or ""
+        if lines[line_no - 1].strip() != segment.strip():
+            return False, None
+        fixed = "".join(lines[: line_no - 1] + lines[line_no:])
+        if not _compiles(fixed, file_path):
+            return False, None
+        return True, fixed
+
+    return False, None
+
+
+def _exported_names(tree: ast.Module) -> Set[str]:
+    names = set()
+    for node in tree.body:
+        if isinstance(node, ast.Assign):
+            targets, value = node.targets, node.value
+        elif isinstance(node, (ast.AugAssign, ast.AnnAssign)):
+            targets, value = [node.target], node.value
+        else:
+            continue
+        if not any(isinstance(t, ast.Name) and t.id == "__all__" for t in targets):
+            continue
+        if isinstance(value, (ast.List, ast.Tuple)):
+            names.update(
+                elt.value
+                for elt in value.elts
+                if isinstance(elt, ast.Constant) and isinstance(elt.value, str)
+            )
+    return names
 
 
 class GroqAIAgent:
@@ -19,44 +184,89 @@ class GroqAIAgent:
         if not self.api_key:
             raise RuntimeError("GROQ_API_KEY is required; set it in environment or .env")
 
-        self.client: Optional[OpenAI] = OpenAI(
-            api_key=self.api_key,
-            base_url="https://api.groq.com/openai/v1",
-        )
-
-        self.async_client: Optional[AsyncOpenAI] = AsyncOpenAI(
-            api_key=self.api_key,
-            base_url="https://api.groq.com/openai/v1",
-        )
-
         self.timeout = 60
         self.model = "openai/gpt-oss-20b"
 
+        # Long-lived shared loop so the connection pool survives across fixes.
+        client, self._loop = get_client(self.api_key)
+        self.async_client: Optional[AsyncOpenAI] = client
+
     def is_configured(self) -> bool:
         return bool(self.api_key)
 
+    def close(self) -> None:
+        """
+        Close the shared HTTP clients; other agents lose them too.
+        """
+        self.async_client = None
+        close_clients()
+
     def fix_file(self, file_path: str, bug_type: str, line_no: int) -> bool:
         """
         Safe sync wrapper.
         """
         try:
-            return asyncio.run(self.fix_file_async(file_path, bug_type, line_no))
-        except RuntimeError:
-            # If already inside event loop, user must call async version directly
-            return False
+            return self._run(self.fix_file_async(file_path, bug_type, line_no))
         except Exception:
             return False
 
+    def fix_files(self, items: List[Dict[str, Any]]) -> List[bool]:
+        """
+        Safe sync wrapper around fix_files_async; failures map to False.
+        """
+        try:
+            results = self._run(self.fix_files_async(items))
+        except Exception:
+            return [False] * len(items)
+        return [result is True for result in results]
+
+    async def fix_files_async(self, items: List[Dict[str, Any]]) -> List[Any]:
+        """
+        Fix many files concurrently. Each item holds fix_file_async kwargs.
+
+        Items targeting the same file run one after another so a later fix
+        sees the earlier rewrite instead of racing it.
+        """
+        by_file: Dict[str, List[int]] = {}
+        for idx, item in enumerate(items):
+            by_file.setdefault(item["file_path"], []).append(idx)
+
+        results: List[Any] = [False] * len(items)
+        limit = asyncio.Semaphore(MAX_CONCURRENT_FIXES)
+
+        async def fix_group(indices: List[int]) -> None:
+            for idx in indices:
+                try:
+                    async with limit:
+                        results[idx] = await self.fix_file_async(**items[idx])
+                except Exception as exc:
+                    results[idx] = exc
+
+        await asyncio.gather(
+            *(fix_group(indices) for indices in by_file.values()),
+            return_exceptions=True,
+        )
+        return results
+
     async def fix_file_async(self, file_path: str, bug_type: str, line_no: int) -> bool:
         if not self.async_client:
             return False
 
         try:
-            if not os.path.exists(file_path):
+            # Keep disk I/O off the shared loop so concurrent fixes keep flowing.
+            try:
+                source = await asyncio.to_thread(_read_text, file_path)
+            except FileNotFoundError:
                 return False
 
-            with open(file_path, "r", encoding="utf-8") as f:
-                source = f.read()
+            handled, fixed = await asyncio.to_thread(
+                _local_fix, source, file_path, bug_type, line_no
+            )
+            if handled:
+                if fixed is None:
+                    return False
+                await asyncio.to_thread(_write_text, file_path, fixed)
+                return True
 
             prompt = self._build_prompt(source, bug_type, line_no)
 
@@ -80,14 +290,17 @@ class GroqAIAgent:
                 except SyntaxError:
                     return False
 
-            with open(file_path, "w", encoding="utf-8") as f:
-                f.write(fixed)
+            await asyncio.to_thread(_write_text, file_path, fixed)
 
             return True
 
         except Exception:
             return False
 
+    def _run(self, coro):
+        # Each request is already capped by self.timeout inside the coroutine.
+        return _run_on(self._loop, coro)
+
     def _build_prompt(self, source: str, bug_type: str, line_no: int) -> str:
         return (
             "Return only the full corrected file. No explanations.\n"
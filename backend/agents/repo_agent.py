@@ -2,8 +2,6 @@ import os
 import shutil
 import stat
 
-from git import Repo
-
 
 class RepoAgent:
     """Simple repo clone with clean overwrite."""
@@ -13,6 +11,8 @@ class RepoAgent:
         func(path)
 
     def clone(self, repo_url: str) -> str:
+        # gitpython is heavy to import; load it only when a clone happens.
+        from git import Repo
 
         base = "workspace"
         path = os.path.join(base, "repo")
@@ -23,12 +23,14 @@ class RepoAgent:
         if os.path.exists(path):
             shutil.rmtree(path, onerror=self.remove_readonly)
 
-        # Fresh clone every run
+        # Fresh clone every run. Blobs are fetched lazily: checkout pulls only
+        # the files at HEAD, not every branch tip's snapshot.
         Repo.clone_from(
             repo_url,
             path,
             depth=1,
             no_single_branch=True,
+            filter="blob:none",
         )
 
         return path
@@ -1,13 +1,31 @@
+import asyncio
+import hashlib
 import os
-import subprocess
-from typing import Dict, Tuple
+import shutil
+from typing import Dict, Optional, Tuple
+
+TOOLS = ("pytest", "ruff", "basedpyright")
+TOOLS_HASH = hashlib.sha256(" ".join(TOOLS).encode()).hexdigest()
+# Keep only the tail of each checker's output; the summary and the latest
+# tracebacks live there, and it bounds what BugAgent has to scan.
+MAX_TOOL_OUTPUT = 256 * 1024
 
 
 class TestAgent:
     def __init__(self):
         self._prepared_repos: Dict[str, Tuple[str, str]] = {}
+        # Wheel/HTTP cache shared by every repo run.
+        self._cache = os.path.expanduser("~/.cache/agent-pipcache")
+        self._uv = shutil.which("uv")
+        # Venvs are bound to the interpreter they were created from.
+        self._base_python = os.path.realpath(shutil.which("python3") or "python3")
+        # Ready-made venvs keyed by requirements.txt + tooling.
+        self._venv_pool = os.path.expanduser("~/.cache/agent-venvs")
 
     def run_tests(self, repo_path):
+        return asyncio.run(self.run_tests_async(repo_path))
+
+    async def run_tests_async(self, repo_path):
 
         repo_path = os.path.abspath(repo_path)
         venv_path = os.path.join(repo_path, ".venv")
@@ -19,32 +37,33 @@ class TestAgent:
             self._prepared_repos.pop(repo_path, None)
 
         if repo_path not in self._prepared_repos:
-            self._run(["python3", "-m", "venv", ".venv"], cwd=repo_path, timeout=60)
-
-            # 🚨 Safety check
-            if not os.path.exists(python_bin):
-                return "VENV_CREATION_FAILED"
-
-            # 2️⃣ Install deps
             req_file = os.path.join(repo_path, "requirements.txt")
-
-            install_log = ""
-            if os.path.exists(req_file):
-                req_out, req_rc = self._run(
-                    [pip_bin, "install", "-r", req_file], cwd=repo_path, timeout=180
-                )
-                install_log += req_out or ""
-                if req_rc != 0:
-                    return "ENV_SETUP_FAILED\n" + install_log
-
-            deps_out, deps_rc = self._run(
-                [pip_bin, "install", "pytest", "ruff", "basedpyright"],
-                cwd=repo_path,
-                timeout=180,
-            )
-            install_log += deps_out or ""
-            if deps_rc != 0:
-                return "ENV_SETUP_FAILED\n" + install_log
+            pool_key = self._pool_key(req_file)
+
+            if pool_key is None:
+                error = await self._build_venv(venv_path, repo_path, req_file)
+            else:
+                pooled = os.path.join(self._venv_pool, pool_key)
+                error = None
+                pooled_python = os.path.join(pooled, "bin", "python")
+                # A slot whose interpreter link no longer resolves is rebuilt too.
+                if not (
+                    os.path.exists(os.path.join(pooled, ".ready")) and os.path.exists(pooled_python)
+                ):
+                    # Drop leftovers from an interrupted build before reusing the slot.
+                    shutil.rmtree(pooled, ignore_errors=True)
+                    error = await self._build_venv(pooled, repo_path, req_file)
+                    if error:
+                        shutil.rmtree(pooled, ignore_errors=True)
+                    else:
+                        open(os.path.join(pooled, ".ready"), "w").close()
+                if not error:
+                    # Real copies, not hard links: fixers may rewrite files under
+                    # .venv and must never reach the shared slot.
+                    shutil.rmtree(venv_path, ignore_errors=True)
+                    await asyncio.to_thread(shutil.copytree, pooled, venv_path, symlinks=True)
+            if error:
+                return error
 
             self._prepared_repos[repo_path] = (python_bin, pip_bin)
 
@@ -52,25 +71,34 @@ class TestAgent:
             return "VENV_CREATION_FAILED"
 
         # 3️⃣ Run local analyzer/language-server style checks first.
-        # Ruff can auto-fix a subset of issues (imports, simple lint rules).
-        ruff_out, ruff_rc = self._run(
+        # Ruff can auto-fix a subset of issues (imports, simple lint rules), so it
+        # must finish before anything else reads the sources.
+        ruff_out, ruff_rc = await self._run_async(
             [python_bin, "-m", "ruff", "check", "--fix", "."],
             cwd=repo_path,
             timeout=180,
+            max_output=MAX_TOOL_OUTPUT,
         )
         ruff_text = ruff_out or ""
 
-        # basedpyright provides pyright-compatible static diagnostics.
-        pyright_out, pyright_rc = self._run(
-            [python_bin, "-m", "basedpyright", "."],
-            cwd=repo_path,
-            timeout=180,
+        # 4️⃣ basedpyright (pyright-compatible static diagnostics) and pytest only
+        # read the tree, so run them side by side.
+        (pyright_out, pyright_rc), (test_out, test_rc) = await asyncio.gather(
+            self._run_async(
+                [python_bin, "-m", "basedpyright", "."],
+                cwd=repo_path,
+                timeout=180,
+                max_output=MAX_TOOL_OUTPUT,
+            ),
+            self._run_async(
+                [python_bin, "-m", "pytest"],
+                cwd=repo_path,
+                timeout=300,
+                max_output=MAX_TOOL_OUTPUT,
+            ),
         )
         pyright_text = pyright_out or ""
 
-        # 4️⃣ Run tests
-        test_out, test_rc = self._run([python_bin, "-m", "pytest"], cwd=repo_path, timeout=300)
-
         # If ruff or pyright emitted text, prepend so bug parsing can use it.
         combined = ruff_text + pyright_text + (test_out or "")
 
@@ -80,18 +108,101 @@ class TestAgent:
 
         return combined
 
-    def _run(self, cmd, cwd=None, timeout=120):
+    def _pool_key(self, req_file) -> Optional[str]:
+        digest = hashlib.sha256(TOOLS_HASH.encode())
+        digest.update(self._base_python.encode())
+        if os.path.exists(req_file):
+            with open(req_file, "rb") as f:
+                requirements = f.read()
+            # Options and local paths (-r, -e ., ./pkg) pull in content the hash
+            # does not cover; build those in place instead of pooling.
+            for line in requirements.decode(errors="replace").splitlines():
+                if line.lstrip().startswith(("-", ".", "/", "file:")):
+                    return None
+            digest.update(requirements)
+        return digest.hexdigest()
+
+    async def _build_venv(self, venv_path, repo_path, req_file) -> Optional[str]:
+        python_bin = os.path.join(venv_path, "bin", "python")
+        pip_bin = os.path.join(venv_path, "bin", "pip")
+
+        if self._uv:
+            venv_cmd = [self._uv, "venv", "--seed", "--python", "python3", venv_path]
+        else:
+            venv_cmd = ["python3", "-m", "venv", venv_path]
+        await self._run_async(venv_cmd, cwd=repo_path, timeout=60)
+
+        # 🚨 Safety check
+        if not os.path.exists(python_bin):
+            return "VENV_CREATION_FAILED"
+
+        # 2️⃣ Install deps and tooling in one resolver run; two concurrent
+        # pip processes writing into the same venv would race.
+        install_cmd = self._install_cmd(python_bin, pip_bin)
+        if os.path.exists(req_file):
+            install_cmd += ["-r", req_file]
+        install_cmd += list(TOOLS)
+
+        install_log, install_rc = await self._run_async(install_cmd, cwd=repo_path, timeout=360)
+        if install_rc != 0:
+            return "ENV_SETUP_FAILED\n" + (install_log or "")
+        return None
+
+    def _install_cmd(self, python_bin, pip_bin):
+        if self._uv:
+            return [self._uv, "pip", "install", "--python", python_bin, "--cache-dir", self._cache]
+        return [pip_bin, "install", "--prefer-binary", "--no-compile", "--cache-dir", self._cache]
+
+    async def _run_async(self, cmd, cwd=None, timeout=120, max_output=None):
         try:
-            completed = subprocess.run(
-                cmd,
+            proc = await asyncio.create_subprocess_exec(
+                *cmd,
                 cwd=cwd,
-                capture_output=True,
-                text=True,
-                timeout=timeout,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
             )
-            out = (completed.stdout or "") + (completed.stderr or "")
-            return out, completed.returncode
-        except subprocess.TimeoutExpired:
+        except Exception as exc:
+            return f"COMMAND_FAILED: {' '.join(cmd)} :: {exc}", 1
+
+        try:
+            stdout, stderr, _ = await asyncio.wait_for(
+                asyncio.gather(
+                    _read_tail(proc.stdout, max_output),
+                    _read_tail(proc.stderr, max_output),
+                    proc.wait(),
+                ),
+                timeout,
+            )
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
             return f"COMMAND_TIMEOUT: {' '.join(cmd)}", 124
         except Exception as exc:
             return f"COMMAND_FAILED: {' '.join(cmd)} :: {exc}", 1
+
+        out = stdout.decode(errors="replace") + stderr.decode(errors="replace")
+        return out, proc.returncode
+
+
+async def _read_tail(stream, limit):
+    if limit is None:
+        return await stream.read()
+
+    # Trim as we go so a chatty tool cannot grow the buffer without bound.
+    buf = bytearray()
+    truncated = False
+    while chunk := await stream.read(64 * 1024):
+        buf += chunk
+        if len(buf) > 2 * limit:
+            del buf[:-limit]
+            truncated = True
+
+    if len(buf) > limit:
+        del buf[:-limit]
+        truncated = True
+    if truncated:
+        # Drop the partial first line left by the cut.
+        newline = buf.find(b"\n")
+        if newline != -1:
+            del buf[: newline + 1]
+    return bytes(buf)
@@ -1,9 +1,12 @@
 import asyncio
-import json
 import logging
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 from pathlib import Path
 
-from fastapi import BackgroundTasks, FastAPI, HTTPException, Request
+import orjson
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import FileResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
@@ -11,8 +14,22 @@ from pydantic import BaseModel
 
 from orchestrator import Orchestrator
 
-app = FastAPI()
 orch = Orchestrator()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Runs execute off the event loop, one at a time, so SSE and /health stay
+    # responsive while the orchestrator blocks on clones and subprocesses.
+    app.state.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="orchestrator")
+    app.state.run_future = None
+    yield
+    app.state.executor.shutdown(wait=False, cancel_futures=True)
+    # Release the Groq client's aiohttp connector on shutdown.
+    await asyncio.to_thread(orch.fix.close)
+
+
+app = FastAPI(lifespan=lifespan)
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 FRONTEND_DIST = PROJECT_ROOT / "backend" / "static"
 
@@ -26,6 +43,11 @@ class HealthFilter(logging.Filter):
 
 logging.getLogger("uvicorn.access").addFilter(HealthFilter())
 
+# Orchestrator run logs go to the event bus; mirror them on stdout.
+_agent_stdout = logging.StreamHandler(sys.stdout)
+_agent_stdout.setFormatter(logging.Formatter("[AGENT] %(message)s"))
+logging.getLogger("agent").addHandler(_agent_stdout)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=[
@@ -46,12 +68,14 @@ class RunPayload(BaseModel):
 
 
 @app.post("/run-agent")
-def run_agent(payload: RunPayload, background_tasks: BackgroundTasks):
+async def run_agent(payload: RunPayload, request: Request):
+    state = request.app.state
 
-    if orch.status.get("state") == "RUNNING":
+    if state.run_future is not None and not state.run_future.done():
         raise HTTPException(status_code=409, detail="Agent is already running")
 
-    background_tasks.add_task(
+    state.run_future = asyncio.get_running_loop().run_in_executor(
+        state.executor,
         orch.run,
         payload.repo_url,
         payload.team_name,
@@ -69,7 +93,7 @@ def get_results():
 
 @app.get("/timeline")
 def get_timeline():
-    return {"runs": orch.timeline, "steps": orch.status_mgr.timeline}
+    return {"runs": orch.timeline, "steps": list(orch.status_mgr.timeline)}
 
 
 @app.get("/fixes")
@@ -86,32 +110,29 @@ def get_status():
 async def stream_events(request: Request, last_id: int = 0):
     async def event_generator():
         cursor = int(last_id or 0)
-        keepalive_ticks = 0
         while True:
             if await request.is_disconnected():
                 break
 
-            events = orch.event_bus.get_since(cursor)
-            if events:
-                for event in events:
-                    cursor = max(cursor, event["id"])
-                    payload = {
-                        "type": event["type"],
-                        "message": event["message"],
-                        "timestamp": event["timestamp"],
-                    }
-                    yield (
-                        f"id: {event['id']}\n"
-                        f"event: {event['type']}\n"
-                        f"data: {json.dumps(payload)}\n\n"
-                    )
-                keepalive_ticks = 0
-            else:
-                keepalive_ticks += 1
-                if keepalive_ticks >= 15:
-                    keepalive_ticks = 0
-                    yield ": keepalive\n\n"
-                await asyncio.sleep(0.4)
+            # Wakes as soon as the orchestrator publishes; empty on timeout.
+            events = await orch.event_bus.wait_for(cursor, timeout=15)
+            if not events:
+                yield b": keepalive\n\n"
+                continue
+
+            for event in events:
+                cursor = max(cursor, event["id"])
+                payload = {
+                    "type": event["type"],
+                    "message": event["message"],
+                    "timestamp": event["timestamp"],
+                }
+                # orjson emits bytes; frame the event without a str round-trip.
+                yield (
+                    f"id: {event['id']}\nevent: {event['type']}\ndata: ".encode()
+                    + orjson.dumps(payload)
+                    + b"\n\n"
+                )
 
     return StreamingResponse(
         event_generator(),
@@ -171,3 +192,21 @@ if FRONTEND_DIST.exists():
         if candidate.exists() and candidate.is_file():
             return FileResponse(candidate)
         return FileResponse(FRONTEND_DIST / "index.html")
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    # One worker: the orchestrator, its event bus and status live in this
+    # process, so extra workers would each see a different run. Pass the app
+    # object so uvicorn does not import this module a second time as "main".
+    uvicorn.run(
+        app,
+        host="127.0.0.1",
+        port=8000,
+        loop="uvloop",
+        http="httptools",
+        limit_concurrency=1024,
+        backlog=2048,
+        workers=1,
+    )
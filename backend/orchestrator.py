@@ -1,3 +1,6 @@
+import itertools
+import logging
+import os
 import time
 import zipfile
 from datetime import datetime, timezone
@@ -8,15 +11,23 @@ from agents.fix_agent import FixAgent
 from agents.git_agent import GitAgent
 from agents.repo_agent import RepoAgent
 from agents.test_agent import TestAgent
-from utils.event_bus import RuntimeEventBus
+from utils.event_bus import EventBusHandler, RuntimeEventBus
 from utils.results_manager import ResultsManager
 from utils.status_manager import StatusManager
 
+logger = logging.getLogger("agent")
+_instance_ids = itertools.count()
+
 
 class Orchestrator:
     def __init__(self):
 
         self.event_bus = RuntimeEventBus()
+        # Run logs reach this instance's SSE subscribers through its own child
+        # logger; records still propagate to "agent", where main adds stdout.
+        self._logger = logger.getChild(f"orchestrator{next(_instance_ids)}")
+        self._logger.setLevel(logging.INFO)
+        self._logger.addHandler(EventBusHandler(self.event_bus))
         self.repo = RepoAgent()
         self.test = TestAgent()
         self.bug = BugAgent()
@@ -35,20 +46,12 @@ class Orchestrator:
     def _upsert_fixes(self, fixes):
         for item in fixes:
             key = (item["file"], item["bug_type"], item["line"])
-            existing_pos = self._fix_index.get(key)
-
-            if existing_pos is None:
-                self._fix_index[key] = len(self.fixes)
+            pos = self._fix_index.setdefault(key, len(self.fixes))
+            # Keep the latest attempt; a later Fixed naturally replaces a Failed.
+            if pos == len(self.fixes):
                 self.fixes.append(item)
-                continue
-
-            existing = self.fixes[existing_pos]
-            # Prefer successful resolution over repeated failures.
-            if existing.get("status") != "Fixed" and item.get("status") == "Fixed":
-                self.fixes[existing_pos] = item
             else:
-                # Keep latest commit message/status for visibility.
-                self.fixes[existing_pos] = item
+                self.fixes[pos] = item
 
     def run(self, repo_url, team, leader, retry_limit):
         self.timeline = []
@@ -84,7 +87,7 @@ class Orchestrator:
                 failures = self.test.run_tests(path)
 
                 if not failures:
-                    self._log(f"Tests run {i + 1}/{retry_limit}: PASSED")
+                    self._log("Tests run %d/%d: PASSED", i + 1, retry_limit)
                     self.timeline.append(
                         {
                             "run": i + 1,
@@ -101,24 +104,27 @@ class Orchestrator:
                         "timestamp": run_at,
                     }
                 )
-                self._log(f"Tests run {i + 1}/{retry_limit}: FAILED")
+                self._log("Tests run %d/%d: FAILED", i + 1, retry_limit)
 
                 self.status_mgr.set_step("Bug Detection", iteration=i + 1)
                 bugs = self.bug.parse(failures)
                 self.status_mgr.update_counts(failures=len(bugs))
                 if bugs:
-                    self._log(f"Detected {len(bugs)} failures")
+                    self._log("Detected %d failures", len(bugs))
                     for idx, bug in enumerate(bugs, start=1):
                         self._log(
-                            f" Failure #{idx}: {bug['bug_type']} at {bug['file']}:{bug['line']}"
+                            " Failure #%d: %s at %s:%s",
+                            idx,
+                            bug["bug_type"],
+                            bug["file"],
+                            bug["line"],
                         )
                 else:
                     self._log("Tests failed but no parseable failures; marking UNKNOWN")
                     snippet = "\n".join((failures or "").splitlines()[:5]).strip()
                     if snippet:
-                        self._log(f" Raw failure snippet: {snippet}")
+                        self._log(" Raw failure snippet: %s", snippet)
                 attemptable = []
-                skipped = []
 
                 for bug in bugs:
                     key = (bug["file"], bug["bug_type"], bug["line"])
@@ -136,22 +142,25 @@ class Orchestrator:
                 self.status_mgr.set_step("Fixing", iteration=i + 1)
                 fixes = self.fix.apply_fixes(path, attemptable)
 
+                fixed_count = 0
                 for item in fixes:
                     key = (item["file"], item["bug_type"], item["line"])
                     if item.get("status") == "Fixed":
+                        fixed_count += 1
                         self._bug_fail_counts.pop(key, None)
                     else:
                         self._bug_fail_counts[key] = self._bug_fail_counts.get(key, 0) + 1
                 for idx, item in enumerate(fixes, start=1):
                     self._log(
-                        f" Fix #{idx}: {item.get('status')} - {item['bug_type']} {item['file']}:{item['line']}"
+                        " Fix #%d: %s - %s %s:%s",
+                        idx,
+                        item.get("status"),
+                        item["bug_type"],
+                        item["file"],
+                        item["line"],
                     )
 
-                fixes.extend(skipped)
-
-                self.status_mgr.update_counts(
-                    fixes_applied=len([f for f in fixes if f["status"] == "Fixed"])
-                )
+                self.status_mgr.update_counts(fixes_applied=fixed_count)
                 self.status_mgr.mark_step("Fixing", "Done")
 
                 self.status_mgr.set_step("Commit", iteration=i + 1)
@@ -159,15 +168,16 @@ class Orchestrator:
                 if committed:
                     total_commits += 1
                     self._log(
-                        f"Committed fixes: {len([f for f in fixes if f['status'] == 'Fixed'])} "
-                        f"(total commits: {total_commits})"
+                        "Committed fixes: %d (total commits: %d)",
+                        fixed_count,
+                        total_commits,
                     )
                 else:
                     self._log("No changes to commit")
                 self.status_mgr.mark_step("Commit", "Done")
 
                 total_failures += len(bugs)
-                total_fixes += len([f for f in fixes if f["status"] == "Fixed"])
+                total_fixes += fixed_count
                 self._upsert_fixes(fixes)
 
             ended_at = datetime.now(timezone.utc)
@@ -236,17 +246,26 @@ class Orchestrator:
 
         skip_dirs = {".git", ".venv", "__pycache__", ".pytest_cache", "node_modules"}
 
-        with zipfile.ZipFile(archive_path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
-            for file_path in root.rglob("*"):
-                if not file_path.is_file():
-                    continue
-
-                rel = file_path.relative_to(root)
-                if any(part in skip_dirs for part in rel.parts):
-                    continue
-
-                archive.write(file_path, rel.as_posix())
-
-    def _log(self, message: str):
-        print(f"[AGENT] {message}")
-        self.event_bus.publish("log", message)
+        # Short-lived download artifact: skip deflate, which dominated archive time.
+        with zipfile.ZipFile(archive_path, "w", compression=zipfile.ZIP_STORED) as archive:
+            for file_path, rel in self._iter_files(repo_path, skip_dirs):
+                archive.write(file_path, rel)
+
+    @staticmethod
+    def _iter_files(root: str, skip_dirs):
+        # Prune skipped directories before descending; .git/.venv dominate the tree.
+        stack = [(root, "")]
+        while stack:
+            dir_path, prefix = stack.pop()
+            with os.scandir(dir_path) as entries:
+                for entry in entries:
+                    if entry.name in skip_dirs:
+                        continue
+                    rel = prefix + entry.name
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append((entry.path, rel + "/"))
+                    elif entry.is_file():
+                        yield entry.path, rel
+
+    def _log(self, message: str, *args):
+        self._logger.info(message, *args)
@@ -1,6 +1,9 @@
+import asyncio
+import logging
 import threading
 import time
 from collections import deque
+from itertools import islice
 
 
 class RuntimeEventBus:
@@ -10,6 +13,7 @@ class RuntimeEventBus:
         self._lock = threading.Lock()
         self._events = deque(maxlen=max_events)
         self._next_id = 1
+        self._waiters = []
 
     def publish(self, event_type: str, message: str):
         with self._lock:
@@ -21,8 +25,56 @@ class RuntimeEventBus:
             }
             self._events.append(event)
             self._next_id += 1
-            return event["id"]
+            waiters, self._waiters = self._waiters, []
+
+        # Publishers run in worker threads; wake subscribers on their own loops.
+        for loop, waiter in waiters:
+            try:
+                loop.call_soon_threadsafe(waiter.set)
+            except RuntimeError:
+                pass  # Subscriber loop already closed.
+        return event["id"]
 
     def get_since(self, last_id: int):
         with self._lock:
-            return [event for event in self._events if event["id"] > last_id]
+            return self._since(last_id)
+
+    async def wait_for(self, last_id: int, timeout: float):
+        """Return events newer than last_id, waiting up to timeout for one."""
+        entry = (asyncio.get_running_loop(), asyncio.Event())
+        with self._lock:
+            events = self._since(last_id)
+            if events:
+                return events
+            self._waiters.append(entry)
+
+        try:
+            await asyncio.wait_for(entry[1].wait(), timeout)
+        except asyncio.TimeoutError:
+            return []
+        finally:
+            with self._lock:
+                if entry in self._waiters:
+                    self._waiters.remove(entry)
+        return self.get_since(last_id)
+
+    def _since(self, last_id: int):
+        if not self._events:
+            return []
+        # Ids are contiguous, so the first newer event sits at a fixed offset.
+        start = max(last_id - self._events[0]["id"] + 1, 0)
+        return list(islice(self._events, start, None))
+
+
+class EventBusHandler(logging.Handler):
+    """Forward log records to a RuntimeEventBus as "log" events."""
+
+    def __init__(self, event_bus: RuntimeEventBus):
+        super().__init__()
+        self.event_bus = event_bus
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            self.event_bus.publish("log", self.format(record))
+        except Exception:
+            self.handleError(record)
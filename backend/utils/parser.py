@@ -1,11 +1,18 @@
-import re
-
-
 def extract_line(logs):
 
-    match = re.search(r"line (\d+)", logs)
+    # Scan from the end: the last "line N" is the frame that actually raised.
+    end = len(logs)
+    while True:
+        start = logs.rfind("line ", 0, end)
+        if start < 0:
+            return 0
+
+        digits = stop = start + 5
+        while stop < len(logs) and logs[stop].isdecimal():
+            stop += 1
 
-    if match:
-        return int(match.group(1))
+        if stop > digits:
+            return int(logs[digits:stop])
 
-    return 0
+        # "line " without a number, e.g. "command line error"; keep looking.
+        end = start
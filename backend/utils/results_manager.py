@@ -1,8 +1,14 @@
 import json
 import os
 
+RESULTS_PATH = "results/results.json"
+
 
 class ResultsManager:
+    def __init__(self):
+        # (mtime_ns, size) of the parsed file and its contents.
+        self._cache = (None, {})
+
     def generate(
         self,
         repo_url,
@@ -40,13 +46,26 @@ class ResultsManager:
 
         os.makedirs("results", exist_ok=True)
 
-        with open("results/results.json", "w") as f:
+        with open(RESULTS_PATH, "w") as f:
             json.dump(data, f, indent=2)
+        self._cache = (None, {})
 
     def load(self):
 
         try:
-            with open("results/results.json") as f:
-                return json.load(f)
+            st = os.stat(RESULTS_PATH)
+        except FileNotFoundError:
+            return {}
+
+        stamp = (st.st_mtime_ns, st.st_size)
+        if stamp == self._cache[0]:
+            return self._cache[1]
+
+        try:
+            with open(RESULTS_PATH) as f:
+                data = json.load(f)
         except FileNotFoundError:
             return {}
+
+        self._cache = (stamp, data)
+        return data
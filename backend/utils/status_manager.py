@@ -1,12 +1,20 @@
 import threading
-from typing import Any, Dict, List, Optional
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+# Steps kept per run; older entries fall off the front.
+MAX_TIMELINE = 10_000
 
 
 class StatusManager:
-    """Thread-safe runtime status tracker for the pipeline."""
+    """Runtime status tracker for the pipeline.
+
+    Single-key dict writes and deque appends are atomic under the GIL, so
+    readers never lock; only reset() moves several fields together.
+    """
 
     def __init__(self):
-        self._lock = threading.Lock()
+        self._lock = threading.RLock()
         self._state: Dict[str, Any] = {
             "state": "IDLE",
             "current_step": "",
@@ -16,7 +24,7 @@ class StatusManager:
             "fixes_applied": 0,
             "branch_name": "",
         }
-        self.timeline: List[Dict[str, Any]] = []
+        self.timeline: Deque[Dict[str, Any]] = deque(maxlen=MAX_TIMELINE)
 
     def reset(self, total_iterations: int, branch: str = ""):
         with self._lock:
@@ -31,40 +39,34 @@ class StatusManager:
                     "branch_name": branch,
                 }
             )
-            self.timeline = []
+            self.timeline = deque(maxlen=MAX_TIMELINE)
 
     def set_step(self, step: str, iteration: Optional[int] = None):
-        with self._lock:
-            if iteration is not None:
-                self._state["iteration"] = iteration
-            self._state["current_step"] = step
-            self.timeline.append({"step": step, "status": "In-Progress"})
+        if iteration is not None:
+            self._state["iteration"] = iteration
+        self._state["current_step"] = step
+        self.timeline.append({"step": step, "status": "In-Progress"})
 
     def mark_step(self, step: str, status: str):
-        with self._lock:
-            self.timeline.append({"step": step, "status": status})
+        self.timeline.append({"step": step, "status": status})
 
     def update_counts(self, failures: Optional[int] = None, fixes_applied: Optional[int] = None):
-        with self._lock:
-            if failures is not None:
-                self._state["failures"] = failures
-            if fixes_applied is not None:
-                self._state["fixes_applied"] = fixes_applied
+        if failures is not None:
+            self._state["failures"] = failures
+        if fixes_applied is not None:
+            self._state["fixes_applied"] = fixes_applied
 
     def set_state(self, state: str, error: str = ""):
-        with self._lock:
-            self._state["state"] = state
-            if error:
-                self._state["error"] = error
-            elif "error" in self._state:
-                self._state.pop("error", None)
+        self._state["state"] = state
+        if error:
+            self._state["error"] = error
+        else:
+            self._state.pop("error", None)
 
     def set_branch(self, branch: str):
-        with self._lock:
-            self._state["branch_name"] = branch
+        self._state["branch_name"] = branch
 
     def snapshot(self) -> Dict[str, Any]:
-        with self._lock:
-            snap = dict(self._state)
-            snap["timeline"] = list(self.timeline)
-            return snap
+        snap = dict(self._state)
+        snap["timeline"] = list(self.timeline)
+        return snap